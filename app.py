@@ -1,12 +1,59 @@
-from flask import Flask, request, jsonify, render_template
+import os
+
+# Thread pools are sized when TensorFlow/OpenMP initialize, so this must run before
+# importing them. Default to the physical cores this process may run on (its
+# affinity mask, which honors cpusets / taskset): hyperthread siblings share the
+# core's vector units, and every CPU on the host oversubscribes, so either causes
+# latency spikes. A cgroup CPU quota is not visible here; set INTRA_OP_THREADS to
+# match it.
+def _physical_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        cpus = os.sched_getaffinity(0)
+    else:
+        cpus = range(os.cpu_count() or 1)
+    cores = set()
+    try:
+        for cpu in cpus:
+            topology = f"/sys/devices/system/cpu/cpu{cpu}/topology/"
+            with open(topology + "physical_package_id") as f:
+                package = f.read().strip()
+            with open(topology + "core_id") as f:
+                cores.add((package, f.read().strip()))
+    except OSError:
+        # no sysfs topology (non-Linux, restricted container): use logical CPUs
+        return len(cpus) or 1
+    return len(cores) or 1
+
+INTRA_OP_THREADS = int(os.environ.get("INTRA_OP_THREADS", _physical_cores()))
+os.environ.setdefault("OMP_NUM_THREADS", str(INTRA_OP_THREADS))
+os.environ.setdefault("TF_NUM_INTRAOP_THREADS", str(INTRA_OP_THREADS))
+# oneDNN (AVX-512 / VNNI) kernels for the conv stack; already the default on x86
+# Linux builds since TF 2.9, set explicitly so other platforms/builds opt in too
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "1")
+
+from flask import Flask, Response, request, jsonify, render_template
 import tensorflow as tf
 import numpy as np
+import orjson
 from PIL import Image
-import os
 import json
+import time
+import queue
+import hashlib
 import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from typing import Optional, Any, Tuple, Dict
 
+# one forward pass at a time runs on the inference worker, so a single inter-op
+# thread suffices; intra-op threads parallelize each conv/matmul
+try:
+    tf.config.threading.set_intra_op_parallelism_threads(INTRA_OP_THREADS)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+except RuntimeError as e:
+    # raised if the TF runtime was already initialized (e.g. by an importing test)
+    print("[WARN] Could not set TensorFlow thread counts:", e)
+
 # ==============================
 # FLASK SETUP
 # ==============================
@@ -17,7 +64,9 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Prefer common filenames present in the repository. Try multiple fallbacks so
 # deployment naming differences don't prevent model loading.
-_candidate_models = ["Kidney.h5", "kidney.h5", "kidneymodels.keras", "Kidney.keras"]
+# An INT8 TFLite conversion (see convert_tflite.py), ONNX export (see
+# convert_onnx.py) or frozen graph (written by train.py) is preferred when present.
+_candidate_models = ["Kidney.tflite", "Kidney.onnx", "Kidney_frozen.pb", "Kidney.h5", "kidney.h5", "kidneymodels.keras", "Kidney.keras"]
 MODEL_PATH: Optional[str] = None
 for _n in _candidate_models:
     _p = os.path.join(BASE_DIR, _n)
@@ -43,64 +92,200 @@ if LABELS_PATH is None:
 # LOAD MODEL
 # ==============================
 model: Optional[Any] = None
+# graph function traced once after load; used instead of `model.predict` per request
+infer: Optional[Any] = None
+# opt-in: compile `infer` with XLA. Off by default: compiling VGG16 for every batch
+# bucket adds seconds to worker boot, and XLA-compiled functions bypass the oneDNN
+# kernels (TF_ENABLE_ONEDNN_OPTS) that the plain graph function uses on CPU.
+XLA_JIT = os.environ.get("XLA_JIT", "0") == "1"
+# whether the current `infer` is XLA-compiled (False if XLA was disabled or unavailable)
+infer_jit = False
+# set instead of `infer` when serving a .tflite model; only the inference worker uses it
+interpreter: Optional[Any] = None
+# interpreter tensor details, read once at load (index/dtype/quantization don't change
+# on resize)
+_tflite_input_detail: Optional[Dict[str, Any]] = None
+_tflite_output_detail: Optional[Dict[str, Any]] = None
+# one interpreter per batch bucket, each allocated once for its size. An interpreter
+# holds a single allocation, so resizing one back and forth would re-prepare it (and
+# its XNNPACK delegate) whenever the bucket changes. The weights are mmapped from
+# MODEL_PATH and shared; each extra interpreter only adds its activation arena.
+# Only the inference worker touches this dict.
+_tflite_interpreters: Dict[int, Any] = {}
+# set instead of `infer` when serving a .onnx model through ONNX Runtime
+onnx_session: Optional[Any] = None
+# input dtype the loaded model expects: float32 in [0, 1] (Kidney.h5), or raw uint8
+# pixels for models with the /255 rescaling folded into the graph (see train.py)
+input_dtype: Any = np.float32
 # lock to prevent concurrent model loads in multi-thread/process servers
 _model_lock = threading.Lock()
 
+def _keras_input_dtype(model_obj: Any) -> Any:
+    try:
+        dtype = model_obj.inputs[0].dtype
+        return np.dtype(getattr(dtype, "as_numpy_dtype", dtype)).type
+    except Exception:
+        return np.float32
+
+def _trace_infer(model_obj: Any, dtype: Any, jit_compile: bool) -> Any:
+    fn = tf.function(
+        lambda x: model_obj(x, training=False),
+        input_signature=[tf.TensorSpec((None, 224, 224, 3), tf.as_dtype(dtype))],
+        jit_compile=jit_compile,
+    )
+    return fn.get_concrete_function()
+
+def _build_infer(model_obj: Any, dtype: Any) -> Tuple[Optional[Any], bool]:
+    """Trace `model_obj` once into a concrete function for the fixed 224x224x3 input.
+    The batch dimension stays dynamic so micro-batches reuse the same trace.
+    Returns (function, is_xla_compiled)."""
+    if XLA_JIT:
+        try:
+            fn = _trace_infer(model_obj, dtype, True)
+            # XLA compiles on first execution; run once so a build without XLA support
+            # falls back here instead of failing requests
+            fn(tf.zeros((1, 224, 224, 3), tf.as_dtype(dtype)))
+            return fn, True
+        except Exception as e:
+            print("[WARN] XLA compilation unavailable, using the plain graph function:", e)
+    try:
+        return _trace_infer(model_obj, dtype, False), False
+    except Exception as e:
+        print("[WARN] Could not trace inference function, calling the model directly:", e)
+        return None, False
+
+def _load_tflite(path: str) -> Any:
+    print(f"Attempting to load TFLite model from: {path}")
+    interp = tf.lite.Interpreter(model_path=path, num_threads=INTRA_OP_THREADS)
+    interp.allocate_tensors()
+    print("[OK] TFLite model loaded successfully")
+    return interp
+
+# tensor names written by the frozen-graph export in train.py
+FROZEN_INPUT = "input:0"
+FROZEN_OUTPUT = "probabilities:0"
+
+def _load_frozen_graph(path: str) -> Any:
+    print(f"Attempting to load frozen graph from: {path}")
+    graph_def = tf.compat.v1.GraphDef()
+    with open(path, "rb") as f:
+        graph_def.ParseFromString(f.read())
+    wrapped = tf.compat.v1.wrap_function(lambda: tf.compat.v1.import_graph_def(graph_def, name=""), [])
+    fn = wrapped.prune(feeds=FROZEN_INPUT, fetches=FROZEN_OUTPUT)
+    print("[OK] Frozen graph loaded successfully")
+    return fn
+
+def _load_onnx(path: str) -> Any:
+    import onnxruntime as _ort
+    print(f"Attempting to load ONNX model from: {path}")
+    so = _ort.SessionOptions()
+    so.intra_op_num_threads = INTRA_OP_THREADS
+    so.graph_optimization_level = _ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # prefer accelerated CPU providers when the installed onnxruntime build has them
+    preferred = ["OpenVINOExecutionProvider", "DnnlExecutionProvider", "CPUExecutionProvider"]
+    available = _ort.get_available_providers()
+    providers = [p for p in preferred if p in available] or available
+    sess = _ort.InferenceSession(path, sess_options=so, providers=providers)
+    print("[OK] ONNX model loaded successfully with providers:", sess.get_providers())
+    return sess
+
+def _load_model() -> Tuple[bool, Optional[str]]:
+    """Load MODEL_PATH with the backend matching its extension. Caller holds `_model_lock`."""
+    global model, infer, infer_jit, interpreter, onnx_session, input_dtype
+    global _tflite_input_detail, _tflite_output_detail
+    if MODEL_PATH.endswith(".tflite"):
+        try:
+            interpreter = _load_tflite(MODEL_PATH)
+            _tflite_input_detail = interpreter.get_input_details()[0]
+            _tflite_output_detail = interpreter.get_output_details()[0]
+            _tflite_interpreters.clear()
+            _tflite_interpreters[int(_tflite_input_detail["shape"][0])] = interpreter
+            input_dtype = _tflite_input_detail["dtype"]
+            if input_dtype == np.int8:
+                # fully-quantized model: preprocess as float, quantize in _tflite_forward
+                input_dtype = np.float32
+            model = interpreter
+            return True, None
+        except Exception as e:
+            print("[ERROR] Failed to load TFLite model:", e)
+            return False, f"tflite_error: {e}"
+    if MODEL_PATH.endswith(".onnx"):
+        try:
+            onnx_session = _load_onnx(MODEL_PATH)
+            input_dtype = np.uint8 if onnx_session.get_inputs()[0].type == "tensor(uint8)" else np.float32
+            model = onnx_session
+            return True, None
+        except Exception as e:
+            print("[ERROR] Failed to load ONNX model:", e)
+            return False, f"onnx_error: {e}"
+    if MODEL_PATH.endswith(".pb"):
+        try:
+            infer = _load_frozen_graph(MODEL_PATH)
+            infer_jit = False
+            input_dtype = infer.inputs[0].dtype.as_numpy_dtype
+            model = infer
+            return True, None
+        except Exception as e:
+            print("[ERROR] Failed to load frozen graph:", e)
+            return False, f"frozen_graph_error: {e}"
+    try:
+        print(f"Attempting to load model with tf.keras from: {MODEL_PATH}")
+        # Some saved models reference internal paths like `keras.src.models.functional`.
+        # Create lightweight sys.modules aliases so deserialization can import them.
+        try:
+            import sys as _sys
+            import importlib as _importlib
+            # map keras.src -> keras, keras.src.models -> keras.models, etc.
+            if 'keras' in _sys.modules:
+                _keras_mod = _sys.modules['keras']
+            else:
+                _keras_mod = _importlib.import_module('keras')
+            # ensure submodule aliases
+            _sys.modules.setdefault('keras.src', _keras_mod)
+            if hasattr(_keras_mod, 'models'):
+                _sys.modules.setdefault('keras.src.models', _keras_mod.models)
+                try:
+                    _sys.modules.setdefault('keras.src.models.functional', _importlib.import_module('keras.models.functional'))
+                except Exception:
+                    pass
+        except Exception:
+            pass
+        model_obj = tf.keras.models.load_model(MODEL_PATH, compile=False)
+        input_dtype = _keras_input_dtype(model_obj)
+        infer, infer_jit = _build_infer(model_obj, input_dtype)
+        model = model_obj
+        print("[OK] Model loaded successfully with tf.keras")
+        return True, None
+    except Exception as e_tf:
+        import traceback as _tb
+        tb_tf = _tb.format_exc()
+        print("tf.keras failed to load model, will try standalone keras. Error:\n", tb_tf)
+        try:
+            import keras as _keras
+            print(f"Attempting to load model with standalone keras from: {MODEL_PATH}")
+            model_obj = _keras.models.load_model(MODEL_PATH, compile=False)
+            input_dtype = _keras_input_dtype(model_obj)
+            infer, infer_jit = _build_infer(model_obj, input_dtype)
+            model = model_obj
+            print("[OK] Model loaded successfully with standalone keras")
+            return True, None
+        except Exception as e_ks:
+            tb_ks = _tb.format_exc()
+            print("standalone keras failed to load model. Error:\n", tb_ks)
+            return False, f"tf_error: {e_tf}; keras_error: {e_ks}"
+
 def ensure_model_loaded() -> Tuple[bool, Optional[str]]:
     """Ensure the global `model` is loaded. Returns (True, None) on success,
     or (False, error_message) on failure."""
-    global model
     if model is not None:
         return True, None
     with _model_lock:
         if model is not None:
             return True, None
-        try:
-            print(f"Attempting to load model with tf.keras from: {MODEL_PATH}")
-            # Some saved models reference internal paths like `keras.src.models.functional`.
-            # Create lightweight sys.modules aliases so deserialization can import them.
-            try:
-                import sys as _sys
-                import importlib as _importlib
-                # map keras.src -> keras, keras.src.models -> keras.models, etc.
-                if 'keras' in _sys.modules:
-                    _keras_mod = _sys.modules['keras']
-                else:
-                    _keras_mod = _importlib.import_module('keras')
-                # ensure submodule aliases
-                _sys.modules.setdefault('keras.src', _keras_mod)
-                if hasattr(_keras_mod, 'models'):
-                    _sys.modules.setdefault('keras.src.models', _keras_mod.models)
-                    try:
-                        _sys.modules.setdefault('keras.src.models.functional', _importlib.import_module('keras.models.functional'))
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-            model_obj = tf.keras.models.load_model(MODEL_PATH, compile=False)
-            model = model_obj
-            print("[OK] Model loaded successfully with tf.keras")
-            return True, None
-        except Exception as e_tf:
-            import traceback as _tb
-            tb_tf = _tb.format_exc()
-            print("tf.keras failed to load model, will try standalone keras. Error:\n", tb_tf)
-            try:
-                import keras as _keras
-                print(f"Attempting to load model with standalone keras from: {MODEL_PATH}")
-                model_obj = _keras.models.load_model(MODEL_PATH, compile=False)
-                model = model_obj
-                print("[OK] Model loaded successfully with standalone keras")
-                return True, None
-            except Exception as e_ks:
-                tb_ks = _tb.format_exc()
-                print("standalone keras failed to load model. Error:\n", tb_ks)
-                return False, f"tf_error: {e_tf}; keras_error: {e_ks}"
-
-# try to load at import time too (best-effort)
-_ok, _err = ensure_model_loaded()
-if not _ok:
-    print("Model not loaded at import time; will attempt on first request.")
+        ok, err = _load_model()
+    if ok:
+        _warmup_model()
+    return ok, err
 
 # ==============================
 # LOAD LABELS
@@ -115,20 +300,243 @@ if os.path.exists(LABELS_PATH):
     except Exception as e:
         print("[ERROR] Failed to load labels:", e)
 
+# class names indexed by class id for the request path (ids are 0..n-1 in label.json)
+label_names: Tuple[str, ...] = ()
+if labels and sorted(labels) == list(range(len(labels))):
+    label_names = tuple(labels[i] for i in range(len(labels)))
+
+# ==============================
+# PREDICTION CACHE
+# ==============================
+# Repeated uploads of the same image (demos, health pings) are answered from a
+# small LRU keyed by a hash of the raw upload bytes, skipping decode + inference.
+PREDICTION_CACHE_SIZE = int(os.environ.get("PREDICTION_CACHE_SIZE", 256))
+_prediction_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_prediction_cache_lock = threading.Lock()
+
+def _hash_stream(stream: Any, chunk_size: int = 64 * 1024) -> bytes:
+    """Hash a seekable upload stream in chunks and rewind it for decoding."""
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        h.update(chunk)
+    stream.seek(0)
+    return h.digest()
+
+def _cache_get(key: bytes) -> Optional[Dict[str, Any]]:
+    with _prediction_cache_lock:
+        response = _prediction_cache.get(key)
+        if response is not None:
+            _prediction_cache.move_to_end(key)
+        return response
+
+def _cache_put(key: bytes, response: Dict[str, Any]) -> None:
+    if PREDICTION_CACHE_SIZE <= 0:
+        return
+    with _prediction_cache_lock:
+        _prediction_cache[key] = response
+        _prediction_cache.move_to_end(key)
+        while len(_prediction_cache) > PREDICTION_CACHE_SIZE:
+            _prediction_cache.popitem(last=False)
+
+# ==============================
+# INFERENCE WORKER
+# ==============================
+# Request threads only parse the upload and preprocess; the forward pass runs on
+# a single background consumer so uploads/JSON encoding of other requests overlap
+# with inference instead of contending for the model. Concurrent requests are
+# micro-batched: the worker collects up to MAX_BATCH_SIZE inputs, waiting at most
+# BATCH_TIMEOUT_MS after the first one, and runs them as one forward pass.
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", 8))
+BATCH_TIMEOUT_S = float(os.environ.get("BATCH_TIMEOUT_MS", 5)) / 1000.0
+
+_inference_queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+_inference_thread: Optional[threading.Thread] = None
+_inference_thread_lock = threading.Lock()
+# job dequeued that didn't fit in the previous batch; it starts the next one.
+# Only the inference worker thread touches it.
+_carried_job: Optional[Tuple[Any, Future]] = None
+
+def _collect_batch() -> list:
+    global _carried_job
+    if _carried_job is not None:
+        jobs = [_carried_job]
+        _carried_job = None
+    else:
+        jobs = [_inference_queue.get()]
+    rows = len(jobs[0][0])
+    deadline = time.monotonic() + BATCH_TIMEOUT_S
+    # count rows, not jobs: a job that would push the batch past MAX_BATCH_SIZE (e.g. a
+    # multi-row warm-up batch) is held back for the next batch instead of merged
+    while rows < MAX_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            job = _inference_queue.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if rows + len(job[0]) > MAX_BATCH_SIZE:
+            _carried_job = job
+            break
+        jobs.append(job)
+        rows += len(job[0])
+    return jobs
+
+def _tflite_interpreter_for(rows: int) -> Any:
+    interp = _tflite_interpreters.get(rows)
+    if interp is None:
+        interp = tf.lite.Interpreter(model_path=MODEL_PATH, num_threads=INTRA_OP_THREADS)
+        interp.resize_tensor_input(_tflite_input_detail["index"], (rows, 224, 224, 3))
+        interp.allocate_tensors()
+        _tflite_interpreters[rows] = interp
+    return interp
+
+def _tflite_forward(batch: Any) -> Any:
+    input_detail = _tflite_input_detail
+    output_detail = _tflite_output_detail
+    if input_detail["dtype"] == np.int8:
+        scale, zero_point = input_detail["quantization"]
+        batch = np.clip(np.round(batch / scale + zero_point), -128, 127).astype(np.int8)
+    # batches are padded to _batch_bucket sizes, so this is one of a few interpreters
+    interp = _tflite_interpreter_for(len(batch))
+    interp.set_tensor(input_detail["index"], batch)
+    interp.invoke()
+    output = interp.get_tensor(output_detail["index"])
+    if output_detail["dtype"] == np.int8:
+        scale, zero_point = output_detail["quantization"]
+        output = (output.astype(np.float32) - zero_point) * scale
+    return output
+
+def _forward(batch: Any) -> Any:
+    if interpreter is not None:
+        return _tflite_forward(batch)
+    if onnx_session is not None:
+        # onnxruntime releases the GIL for the duration of run()
+        return onnx_session.run(None, {onnx_session.get_inputs()[0].name: batch})[0]
+    if infer is not None:
+        return infer(tf.constant(batch)).numpy()
+    # calling the model directly skips model.predict's per-call Dataset/callback setup
+    return np.asarray(model(tf.constant(batch), training=False))
+
+def _batch_bucket(rows: int) -> int:
+    # XLA compiles separate kernels per batch size and TFLite keeps one allocated
+    # interpreter per size; rounding up to a power of two (capped at
+    # MAX_BATCH_SIZE) bounds the number of shapes compiled / allocated and warmed up
+    if rows >= MAX_BATCH_SIZE:
+        return rows
+    bucket = 1
+    while bucket < rows:
+        bucket *= 2
+    return min(bucket, MAX_BATCH_SIZE)
+
+def _pad_to_bucket() -> bool:
+    return infer_jit or interpreter is not None
+
+def _warmup_batch_sizes() -> list:
+    if _pad_to_bucket():
+        return sorted({_batch_bucket(n) for n in range(1, MAX_BATCH_SIZE + 1)})
+    return sorted({1, MAX_BATCH_SIZE})
+
+def _stack_batch(inputs: list, staging: Any) -> Any:
+    rows = sum(len(x) for x in inputs)
+    padded = _batch_bucket(rows) if _pad_to_bucket() else rows
+    if len(inputs) == 1 and padded == rows:
+        return inputs[0]
+    if padded > len(staging):
+        return np.concatenate(inputs, axis=0)
+    # rows past `rows` are padding; their predictions are never routed to a caller
+    np.concatenate(inputs, axis=0, out=staging[:rows])
+    return staging[:padded]
+
+def _inference_worker() -> None:
+    # Input staging buffer owned by this thread and reused for every micro-batch, so
+    # stacking requests doesn't allocate a fresh (B, 224, 224, 3) array each time.
+    staging = np.empty((MAX_BATCH_SIZE, 224, 224, 3), dtype=input_dtype)
+    while True:
+        jobs = [(x, f) for x, f in _collect_batch() if f.set_running_or_notify_cancel()]
+        if not jobs:
+            continue
+        try:
+            batch = _stack_batch([x for x, _ in jobs], staging)
+            prediction = _forward(batch)
+        except Exception as e:
+            for _, f in jobs:
+                f.set_exception(e)
+            continue
+        # route each caller its own rows of the batched prediction
+        offset = 0
+        for x, f in jobs:
+            f.set_result(prediction[offset:offset + len(x)])
+            offset += len(x)
+
+def _ensure_inference_worker() -> None:
+    # started lazily so the thread is created in the serving process (after any fork)
+    global _inference_thread
+    if _inference_thread is not None and _inference_thread.is_alive():
+        return
+    with _inference_thread_lock:
+        if _inference_thread is None or not _inference_thread.is_alive():
+            _inference_thread = threading.Thread(target=_inference_worker, name="inference-worker", daemon=True)
+            _inference_thread.start()
+
+def run_inference(batch: Any) -> Any:
+    """Queue `batch` for the inference worker and block until its prediction is ready."""
+    _ensure_inference_worker()
+    future: Future = Future()
+    _inference_queue.put((batch, future))
+    return future.result()
+
+def _warmup_batches(batch_sizes: list) -> None:
+    try:
+        for batch_size in batch_sizes:
+            run_inference(np.zeros((batch_size, 224, 224, 3), dtype=input_dtype))
+        print("[OK] Model warmed up for batch sizes:", batch_sizes)
+    except Exception as e:
+        print("[WARN] Model warm-up failed:", e)
+
+def _warmup_model() -> None:
+    """Run synthetic forward passes through the inference worker so the first real
+    request doesn't pay for lazy kernel selection / convolution autotuning
+    (the same idea as TF-Serving's --enable_model_warmup).
+
+    Only batch size 1 is warmed before returning, keeping worker boot short and
+    its peak memory at single-image activations. Larger micro-batch sizes are
+    warmed in the background while the worker already serves requests; their
+    forward passes still run on the inference thread, between real batches."""
+    _warmup_batches([1])
+    remaining = [n for n in _warmup_batch_sizes() if n > 1]
+    if remaining:
+        threading.Thread(target=_warmup_batches, args=(remaining,), name="model-warmup", daemon=True).start()
+
+# try to load at import time too (best-effort)
+_ok, _err = ensure_model_loaded()
+if not _ok:
+    print("Model not loaded at import time; will attempt on first request.")
+
 # ==============================
 # PREPROCESS FUNCTION
 # ==============================
+_INV_255 = np.float32(1.0 / 255.0)
+
 def preprocess_image(image: Image.Image) -> Any:
     image = image.convert("RGB")
     image = image.resize((224, 224), resample=Image.BILINEAR)  # Must match training
-    image = np.array(image, dtype=np.float32)
-    image = image / 255.0  # Must match training normalization
-    image = np.expand_dims(image, axis=0)
-    return image
+    if input_dtype == np.uint8:
+        # normalization is part of the model graph; hand it the raw pixels
+        return np.asarray(image, dtype=np.uint8)[None, ...]
+    # Normalize straight from the uint8 pixels into the (1, 224, 224, 3) output in one
+    # pass. The buffer is per request: concurrent requests are batched together.
+    out = np.empty((1, 224, 224, 3), dtype=np.float32)
+    np.multiply(np.asarray(image), _INV_255, out=out[0])  # Must match training normalization
+    return out
 
 # ==============================
 # ROUTES
 # ==============================
+def _json_response(payload: Dict[str, Any]) -> Response:
+    # orjson serializes the raw prediction ndarray directly (no .tolist() copy)
+    return Response(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY), mimetype="application/json")
+
 @app.route("/")
 def index():
     return render_template("index.html")
@@ -149,30 +557,43 @@ def predict():
         if file.filename == "":
             return jsonify({"error": "Empty filename"}), 400
 
+        cache_key = _hash_stream(file.stream)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return _json_response(cached)
+
         try:
+            # decode from the upload stream itself rather than a second in-memory copy
+            image = Image.open(file.stream)
+            # JPEG only: let libjpeg downscale by powers of two during decode instead
+            # of decoding full resolution scans just to resize them to 224x224
+            image.draft("RGB", (224, 224))
             # force RGB on upload to avoid RGBA/L mismatches
-            image = Image.open(file).convert("RGB")
+            image = image.convert("RGB")
         except Exception:
             return jsonify({"error": "Invalid image file"}), 400
 
         processed = preprocess_image(image)
 
-        prediction = model.predict(processed)
+        prediction = run_inference(processed)
         print("RAW PREDICTION:", prediction)
 
         predicted_class = int(np.argmax(prediction, axis=1)[0])
-        confidence = float(np.max(prediction))
+        confidence = float(prediction[0, predicted_class])  # reuse argmax instead of a second max pass
 
         response = {
             "class_index": predicted_class,
             "confidence": round(confidence, 4),
-            "raw": prediction.tolist()
+            "raw": prediction
         }
 
-        if labels and predicted_class in labels:
+        if predicted_class < len(label_names):
+            response["label"] = label_names[predicted_class]
+        elif labels and predicted_class in labels:
             response["label"] = labels[predicted_class]
 
-        return jsonify(response)
+        _cache_put(cache_key, response)
+        return _json_response(response)
     except Exception as e:
         import traceback as _tb
         tb = _tb.format_exc()
@@ -182,7 +603,10 @@ def predict():
 
 @app.route('/_model_debug', methods=['GET'])
 def model_debug() -> Any:
-    info: Dict[str, Any] = {"model_loaded": model is not None}
+    info: Dict[str, Any] = {"model_loaded": model is not None, "tflite": interpreter is not None,
+                            "onnx": onnx_session is not None, "xla": infer_jit}
+    # Pillow-SIMD reports versions like "9.5.0.post1"
+    info['pillow_version'] = getattr(Image, '__version__', None)
     try:
         info['model_path'] = MODEL_PATH
         info['model_exists'] = os.path.exists(MODEL_PATH)
@@ -191,7 +615,12 @@ def model_debug() -> Any:
     except Exception as e:
         info['path_error'] = str(e)
 
-    if model is not None:
+    if interpreter is not None:
+        info['input_details'] = str(_tflite_input_detail)
+    elif onnx_session is not None:
+        info['providers'] = onnx_session.get_providers()
+        info['input_shape'] = onnx_session.get_inputs()[0].shape
+    elif model is not None:
         try:
             import io as _io
             buf = _io.StringIO()
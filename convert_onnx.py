@@ -0,0 +1,45 @@
+"""
+Kidney Classification Model - ONNX Export Script
+Exports the trained Keras model (Kidney.h5) to ONNX (Kidney.onnx) so it can be
+served with ONNX Runtime.
+
+Requires: pip install tf2onnx onnxruntime
+(or onnxruntime-openvino for the OpenVINO execution provider)
+When Kidney.onnx is present next to app.py the server loads it instead of
+Kidney.h5.
+"""
+
+import tensorflow as tf
+import tf2onnx
+
+# ==============================
+# PARAMETERS
+# ==============================
+img_height = 224
+img_width = 224
+opset = 17
+
+model_path = 'Kidney.h5'
+output_path = 'Kidney.onnx'
+
+# ==============================
+# LOAD MODEL
+# ==============================
+print(f"Loading model from: {model_path}")
+model = tf.keras.models.load_model(model_path, compile=False)
+print("[OK] Model loaded")
+
+# ==============================
+# EXPORT
+# ==============================
+print(f"\nExporting to ONNX (opset {opset})...")
+
+# dynamic batch dimension so the server can run micro-batches
+input_dtype = tf.as_dtype(model.inputs[0].dtype)  # uint8 when rescaling is in-graph
+input_signature = (tf.TensorSpec((None, img_height, img_width, 3), input_dtype, name='input'),)
+# Trace through a tf.function rather than tf2onnx.convert.from_keras, which does
+# not support the Keras 3 models produced by TensorFlow 2.19
+infer_fn = tf.function(lambda x: model(x, training=False), input_signature=input_signature)
+tf2onnx.convert.from_function(infer_fn, input_signature=input_signature, opset=opset, output_path=output_path)
+
+print(f"[OK] Model saved as {output_path}")
@@ -0,0 +1,98 @@
+"""
+Kidney Classification Model - TFLite Conversion Script
+Converts the trained Keras model (Kidney.h5) to a post-training quantized
+TFLite model (Kidney.tflite) for faster CPU inference.
+
+quantization = 'int8': full integer quantization. Calibration uses a
+    representative sample of the training dataset, so update `data_dir` to
+    point at the same dataset used by train.py before running.
+quantization = 'fp16': float16 weights only. Halves the model size with no
+    calibration data and no measurable accuracy change; a safe first step or
+    fallback on CPUs without fast INT8 kernels.
+
+When Kidney.tflite is present next to app.py the server loads it instead of
+Kidney.h5.
+"""
+
+import tensorflow as tf
+
+# ==============================
+# PARAMETERS
+# ==============================
+img_height = 224
+img_width = 224
+num_calibration_images = 200
+quantization = 'int8'  # or 'fp16'
+
+model_path = 'Kidney.h5'
+output_path = 'Kidney.tflite'
+
+# Update this path to your local dataset directory (same as train.py)
+data_dir = 'path/to/CT-KIDNEY-DATASET-Normal-Cyst-Tumor-Stone'
+
+# ==============================
+# LOAD MODEL
+# ==============================
+print(f"Loading model from: {model_path}")
+model = tf.keras.models.load_model(model_path, compile=False)
+print("[OK] Model loaded")
+
+# models trained by the current train.py take uint8 pixels and rescale in-graph;
+# older float models expect the [0, 1] normalization done by app.py
+input_dtype = tf.as_dtype(model.inputs[0].dtype)
+
+converter = tf.lite.TFLiteConverter.from_keras_model(model)
+converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+if quantization == 'fp16':
+    # ==============================
+    # FP16 WEIGHTS
+    # ==============================
+    print("\nConverting to FP16 TFLite...")
+    converter.target_spec.supported_types = [tf.float16]
+else:
+    # ==============================
+    # REPRESENTATIVE DATASET
+    # ==============================
+    print(f"\nLoading calibration images from: {data_dir}")
+
+    calib_ds = tf.keras.utils.image_dataset_from_directory(
+        data_dir,
+        image_size=(img_height, img_width),
+        shuffle=True,
+        seed=123,
+        batch_size=1
+    )
+    calib_ds = calib_ds.map(lambda x, y: x).take(num_calibration_images)
+
+    def representative_dataset():
+        for image in calib_ds:
+            if input_dtype == tf.uint8:
+                yield [tf.saturate_cast(tf.round(image), tf.uint8)]
+            else:
+                yield [tf.cast(image / 255.0, tf.float32)]
+
+    print(f"[OK] Using {num_calibration_images} calibration images")
+
+    # ==============================
+    # INT8
+    # ==============================
+    print("\nConverting to INT8 TFLite...")
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    # int8 I/O drops the float quantize/dequantize ops at the graph edges; app.py
+    # quantizes inputs and dequantizes outputs with the tensors' scale/zero-point.
+    # uint8-input models (pixels in, rescaled in-graph) keep their uint8 input.
+    if input_dtype != tf.uint8:
+        converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+
+# ==============================
+# CONVERT
+# ==============================
+tflite_model = converter.convert()
+
+with open(output_path, "wb") as f:
+    f.write(tflite_model)
+
+print(f"[OK] Model saved as {output_path} ({len(tflite_model) / (1024 * 1024):.1f} MB)")
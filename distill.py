@@ -0,0 +1,160 @@
+"""
+Kidney Classification Model - Knowledge Distillation Script (Reference Only)
+Distills the trained Kidney.h5 teacher into a MobileNetV3-Small student
+(~60 MFLOPs per 224x224 image) for fast CPU serving. This pays off most for the
+shipped VGG16 model (~15 GFLOPs per image); train.py now defaults to a MobileNetV2
+backbone, which is already cheap, so distilling from it gains far less.
+
+Loss: alpha * CE(y_true, student) + (1 - alpha) * T^2 * KL(teacher_T || student_T)
+where *_T are the softmax outputs at temperature T.
+
+Dataset: CT-KIDNEY-DATASET-Normal-Cyst-Tumor-Stone (same as train.py)
+Like models from train.py, the student takes raw uint8 pixels and rescales
+in-graph, so app.py serves it without Python-side normalization. To deploy it,
+convert with convert_tflite.py (model_path = 'Kidney_student.h5').
+"""
+
+import tensorflow as tf
+
+from tensorflow.keras import layers
+from tensorflow.keras.optimizers import Adam
+
+# ==============================
+# PARAMETERS
+# ==============================
+batch_size = 32
+img_height = 224
+img_width = 224
+epochs = 10
+temperature = 4.0
+alpha = 0.1
+
+teacher_path = 'Kidney.h5'
+student_path = 'Kidney_student.h5'
+
+# Update this path to your local dataset directory (same as train.py)
+data_dir = 'path/to/CT-KIDNEY-DATASET-Normal-Cyst-Tumor-Stone'
+
+# ==============================
+# LOAD DATASET
+# ==============================
+print(f"Loading dataset from: {data_dir}")
+
+train_ds = tf.keras.utils.image_dataset_from_directory(
+    data_dir,
+    image_size=(img_height, img_width),
+    validation_split=0.1,
+    subset='training',
+    seed=123,
+    batch_size=batch_size
+)
+
+val_ds = tf.keras.utils.image_dataset_from_directory(
+    data_dir,
+    image_size=(img_height, img_width),
+    validation_split=0.1,
+    subset='validation',
+    seed=123,
+    batch_size=batch_size
+)
+
+num_classes = len(train_ds.class_names)
+
+AUTOTUNE = tf.data.AUTOTUNE
+train_ds = train_ds.map(lambda x, y: (tf.saturate_cast(tf.round(x), tf.uint8), y), num_parallel_calls=AUTOTUNE).prefetch(AUTOTUNE)
+val_ds = val_ds.map(lambda x, y: (tf.saturate_cast(tf.round(x), tf.uint8), y), num_parallel_calls=AUTOTUNE).prefetch(AUTOTUNE)
+
+print("[OK] Dataset loaded")
+
+# ==============================
+# LOAD TEACHER
+# ==============================
+print(f"\nLoading teacher model from: {teacher_path}")
+teacher = tf.keras.models.load_model(teacher_path, compile=False)
+teacher.trainable = False
+# older teachers (the shipped Kidney.h5) take float [0, 1] input instead of uint8
+teacher_takes_uint8 = tf.as_dtype(teacher.inputs[0].dtype) == tf.uint8
+print("[OK] Teacher loaded")
+
+def teacher_input(x):
+    return x if teacher_takes_uint8 else tf.cast(x, tf.float32) / 255.0
+
+# ==============================
+# BUILD STUDENT
+# ==============================
+print("\nBuilding MobileNetV3-Small student...")
+
+student_base = tf.keras.applications.MobileNetV3Small(
+    input_shape=(img_height, img_width, 3),
+    include_top=False,
+    weights='imagenet',
+    include_preprocessing=False
+)
+
+inputs = tf.keras.Input(shape=(img_height, img_width, 3), dtype='uint8')
+# MobileNetV3 expects [-1, 1]; rescale the uint8 pixels in-graph
+x = layers.Rescaling(2.0 / 255.0, offset=-1.0)(inputs)
+x = student_base(x)
+x = layers.GlobalAveragePooling2D()(x)
+x = layers.Dropout(0.2)(x)
+# logits; softmax is applied in the loss and in the exported model below
+logits = layers.Dense(num_classes)(x)
+
+student_logits = tf.keras.Model(inputs, logits, name='kidney_student_logits')
+
+print("[OK] Student created")
+print(f"Student parameters: {student_logits.count_params():,}")
+
+# ==============================
+# DISTILL
+# ==============================
+optimizer = Adam(learning_rate=0.001)
+ce_loss = tf.keras.losses.SparseCategoricalCrossentropy(from_logits=True)
+kl_loss = tf.keras.losses.KLDivergence()
+
+# Kidney.h5 ends in softmax; recover temperature-scaled teacher targets from its log-probabilities
+@tf.function
+def train_step(x, y):
+    teacher_probs = teacher(teacher_input(x), training=False)
+    teacher_soft = tf.nn.softmax(tf.math.log(teacher_probs + 1e-8) / temperature)
+    with tf.GradientTape() as tape:
+        s_logits = student_logits(x, training=True)
+        student_soft = tf.nn.softmax(s_logits / temperature)
+        loss = (alpha * ce_loss(y, s_logits)
+                + (1.0 - alpha) * (temperature ** 2) * kl_loss(teacher_soft, student_soft))
+    grads = tape.gradient(loss, student_logits.trainable_variables)
+    optimizer.apply_gradients(zip(grads, student_logits.trainable_variables))
+    return loss
+
+val_accuracy = tf.keras.metrics.SparseCategoricalAccuracy()
+
+print(f"\nDistilling for {epochs} epochs (T={temperature}, alpha={alpha})...")
+
+for epoch in range(epochs):
+    total_loss = 0.0
+    steps = 0
+    for x, y in train_ds:
+        total_loss += float(train_step(x, y))
+        steps += 1
+
+    val_accuracy.reset_state()
+    for x, y in val_ds:
+        val_accuracy.update_state(y, student_logits(x, training=False))
+
+    print(f"Epoch {epoch + 1}/{epochs} - loss: {total_loss / max(steps, 1):.4f} "
+          f"- val_accuracy: {float(val_accuracy.result()):.4f}")
+
+print("\n[OK] Distillation complete")
+
+# ==============================
+# SAVE STUDENT
+# ==============================
+print("\nSaving student model...")
+
+# same probability output as the teacher so app.py can serve it unchanged
+probs = layers.Softmax()(student_logits.output)
+student = tf.keras.Model(student_logits.input, probs, name='kidney_student_model')
+student.save(student_path)
+
+print(f"[OK] Model saved as {student_path}")
+print("Convert it for serving with convert_tflite.py (model_path = 'Kidney_student.h5')")
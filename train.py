@@ -1,6 +1,7 @@
 """
 Kidney Classification Model - Training Script (Reference Only)
-Trains a VGG16-based transfer learning model for kidney disease classification
+Trains a transfer learning model (MobileNetV2 by default, or VGG16 as used for the
+shipped Kidney.h5) for kidney disease classification
 
 Dataset: CT-KIDNEY-DATASET-Normal-Cyst-Tumor-Stone
 Note: This is a reference script. The model (Kidney.h5) is already trained 
@@ -13,9 +14,10 @@ import tensorflow as tf
 import os
 import json
 
-from tensorflow.keras.applications import VGG16
+from tensorflow.keras.applications import VGG16, MobileNetV2
 from tensorflow.keras import layers
 from tensorflow.keras.optimizers import Adam
+from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
 
 # ==============================
 # PARAMETERS
@@ -25,6 +27,11 @@ img_height = 224
 img_width = 224
 epochs = 10
 
+# 'mobilenet_v2': ~25x fewer params / ~30x fewer FLOPs than VGG16, quantizes cleanly to INT8
+# 'vgg16': the backbone of the shipped Kidney.h5
+backbone = 'mobilenet_v2'
+mobilenet_alpha = 0.75
+
 # Update this path to your local dataset directory
 data_dir = 'path/to/CT-KIDNEY-DATASET-Normal-Cyst-Tumor-Stone'
 # For Kaggle notebook:
@@ -61,45 +68,60 @@ print(f"Classes: {class_names}")
 print(f"Number of classes: {len(class_names)}")
 
 # ==============================
-# NORMALIZATION
+# INPUT PIPELINE
 # ==============================
-print("\nNormalizing images...")
-
-train_ds = train_ds.map(lambda x, y: (x / 255.0, y))
-val_ds = val_ds.map(lambda x, y: (x / 255.0, y))
-
+# The model takes raw uint8 pixels and rescales to [0, 1] inside its graph (see
+# BUILD CUSTOM MODEL), so the server feeds uint8 and skips the /255 in Python.
+# round rather than truncate the resized float pixels, matching PIL's uint8 resize
 AUTOTUNE = tf.data.AUTOTUNE
+train_ds = train_ds.map(lambda x, y: (tf.saturate_cast(tf.round(x), tf.uint8), y), num_parallel_calls=AUTOTUNE)
+val_ds = val_ds.map(lambda x, y: (tf.saturate_cast(tf.round(x), tf.uint8), y), num_parallel_calls=AUTOTUNE)
+
 train_ds = train_ds.prefetch(AUTOTUNE)
 val_ds = val_ds.prefetch(AUTOTUNE)
 
-print("[OK] Images normalized to [0, 1]")
+print("[OK] Input pipeline ready (uint8 pixels)")
 
 # ==============================
-# LOAD VGG16 BASE
+# LOAD BACKBONE
 # ==============================
-print("\nLoading VGG16 base model with ImageNet weights...")
+print(f"\nLoading {backbone} base model with ImageNet weights...")
 
-vgg16_base = VGG16(
-    input_shape=(img_height, img_width, 3),
-    include_top=False,
-    weights='imagenet'
-)
+if backbone == 'vgg16':
+    base_model = VGG16(
+        input_shape=(img_height, img_width, 3),
+        include_top=False,
+        weights='imagenet'
+    )
+else:
+    base_model = MobileNetV2(
+        input_shape=(img_height, img_width, 3),
+        include_top=False,
+        weights='imagenet',
+        alpha=mobilenet_alpha
+    )
 
 # Freeze base layers (transfer learning)
-for layer in vgg16_base.layers:
+for layer in base_model.layers:
     layer.trainable = False
 
-print("[OK] VGG16 base loaded and frozen")
-print(f"VGG16 parameters: {vgg16_base.count_params():,}")
+print(f"[OK] {backbone} base loaded and frozen")
+print(f"{backbone} parameters: {base_model.count_params():,}")
 
 # ==============================
 # BUILD CUSTOM MODEL
 # ==============================
 print("\nBuilding custom model...")
 
-inputs = tf.keras.Input(shape=(img_height, img_width, 3))
-x = vgg16_base(inputs, training=False)
-x = layers.Flatten()(x)
+inputs = tf.keras.Input(shape=(img_height, img_width, 3), dtype='uint8')
+# normalization folded into the graph
+if backbone == 'vgg16':
+    x = layers.Rescaling(1.0 / 255.0)(inputs)
+else:
+    x = layers.Rescaling(1.0 / 127.5, offset=-1.0)(inputs)  # MobileNetV2 expects [-1, 1]
+x = base_model(x, training=False)
+# pooling instead of Flatten: for VGG16 the Dense input shrinks from 7*7*512 = 25088 to 512
+x = layers.GlobalAveragePooling2D()(x)
 x = layers.Dense(128, activation='relu')(x)
 x = layers.Dropout(0.5)(x)
 outputs = layers.Dense(len(class_names), activation='softmax')(x)
@@ -156,6 +178,23 @@ print("\nSaving model...")
 model.save("Kidney.h5")
 print("[OK] Model saved as Kidney.h5")
 
+# ==============================
+# EXPORT FROZEN GRAPH
+# ==============================
+# Inference-only graph with weights folded in as constants: drops training-time
+# metadata and Dropout, and lets Grappler constant-fold and fuse Conv+BiasAdd+Relu.
+# Tensor names "input:0" / "probabilities:0" are what app.py looks up.
+print("Exporting frozen inference graph...")
+
+infer_fn = tf.function(lambda x: tf.identity(model(x, training=False), name='probabilities'))
+concrete = infer_fn.get_concrete_function(
+    tf.TensorSpec([None, img_height, img_width, 3], model.inputs[0].dtype, name='input')
+)
+frozen = convert_variables_to_constants_v2(concrete)
+tf.io.write_graph(frozen.graph.as_graph_def(), '.', 'Kidney_frozen.pb', as_text=False)
+
+print("[OK] Frozen graph saved as Kidney_frozen.pb")
+
 # ==============================
 # SAVE LABELS
 # ==============================
@@ -175,6 +214,7 @@ print("TRAINING COMPLETE")
 print("="*70)
 print(f"\nModel files created:")
 print(f"  - Kidney.h5 (main model)")
+print(f"  - Kidney_frozen.pb (frozen inference graph, served when present)")
 print(f"  - label.json (class labels)")
 print(f"\nTo deploy:")
 print(f"  - Ensure Kidney.h5 and label.json are in the repository")